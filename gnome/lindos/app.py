@@ -1,13 +1,25 @@
-import darkdetect
+from concurrent.futures import ThreadPoolExecutor
+
 import gi
 
 gi.require_version("Gdk", "4.0")
 gi.require_version("Gtk", "4.0")
-from gi.repository import Gdk, Gtk
+from gi.repository import Gdk, GLib, Gtk
 
 from .rust_core import RustCore
 
 APP_ID = "ai.lindos.LindosTrayApp"
+DEBOUNCE_DELAY_MS = 150
+
+# Single worker so Rust calls stay serialized, just off the main thread.
+_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+
+# Key bindings resolved once at import; Gdk.KEY_* lookups otherwise go
+# through the gi introspection proxy on every keystroke.
+_ESCAPE_KEY = Gdk.KEY_Escape
+_CTRL_CLOSE_KEYS = frozenset({Gdk.KEY_space, Gdk.KEY_q, Gdk.KEY_w})
+_CTRL_MASK = Gdk.ModifierType.CONTROL_MASK
+_NO_MODIFIER = Gdk.ModifierType.NO_MODIFIER_MASK
 
 
 class LindosTrayApp(Gtk.ApplicationWindow):
@@ -20,9 +32,13 @@ class LindosTrayApp(Gtk.ApplicationWindow):
         self.set_decorated(False)  # no title bar and borders
         self.set_default_size(300, 100)
 
+        self._pending_source_id = None
+
         self.add_textbox()
         self.connect_keys()
-        self.apply_theme(darkdetect.theme())
+        # Theme detection shells out to gsettings; let the window paint
+        # its first frame before paying for that.
+        GLib.idle_add(self._detect_and_apply_theme)
 
     def add_textbox(self):
         textbox = Gtk.Entry()
@@ -40,6 +56,13 @@ class LindosTrayApp(Gtk.ApplicationWindow):
         ctrl.connect("key-pressed", self.on_key_press)
         self.add_controller(ctrl)
 
+    def _detect_and_apply_theme(self):
+        """Detect the system theme off the startup path and apply it."""
+        import darkdetect  # deferred: importing it costs a subprocess spawn
+
+        self.apply_theme(darkdetect.theme())
+        return GLib.SOURCE_REMOVE
+
     def apply_theme(self, theme: str):
         """Set background color based on the theme."""
         if theme == "Light":
@@ -51,29 +74,61 @@ class LindosTrayApp(Gtk.ApplicationWindow):
             raise NotImplementedError(msg)
 
     def on_text_changed(self, widget, _):
-        """Get the current text from the entry."""
-        text = widget.get_text()
+        """Schedule processing of the current entry text, debounced.
+
+        Keystrokes arrive faster than the Rust core needs to see them;
+        coalescing them into one call per pause keeps the UI responsive.
+        """
+        if self._pending_source_id is not None:
+            GLib.source_remove(self._pending_source_id)
+        self._pending_source_id = GLib.timeout_add(
+            DEBOUNCE_DELAY_MS, self._flush_text, widget.get_text()
+        )
+
+    def _flush_text(self, text):
+        """Forward the debounced entry text to the Rust core."""
+        self._pending_source_id = None
         self.call_external_library(text)
+        return GLib.SOURCE_REMOVE
 
     def call_external_library(self, text):
-        """Call the Rust core library to process the text."""
+        """Call the Rust core library to process the text.
+
+        The FFI call runs on a worker thread so the GTK main loop keeps
+        painting; the result is marshalled back via the main loop.
+        """
         if not text:
             return  # Don't process empty text
 
-        result, error = RustCore.process_with_result(text)
+        future = _EXECUTOR.submit(RustCore.process_with_result, text)
+        future.add_done_callback(
+            lambda done: GLib.idle_add(self._display_result, *done.result())
+        )
 
+    def _display_result(self, result, error):
+        """Report a processing outcome; runs on the main thread."""
         if error:
             print(f"Error processing message: {error.message}")
         else:
             print(f"Rust response: {result}")
-
-    def on_key_press(self, widget, keyval, _, modifier):
+        return GLib.SOURCE_REMOVE
+
+    def on_key_press(
+        self,
+        widget,
+        keyval,
+        _,
+        modifier,
+        # Defaults bind the module constants at class-definition time, so
+        # the per-keystroke comparisons only touch locals (LOAD_FAST).
+        _escape_key=_ESCAPE_KEY,
+        _no_modifier=_NO_MODIFIER,
+        _ctrl_mask=_CTRL_MASK,
+        _ctrl_close_keys=_CTRL_CLOSE_KEYS,
+    ):
         """Close application window on Escape key, Ctrl+Space, Ctrl+W, Ctrl+Q."""
-        if (
-            keyval == Gdk.KEY_Escape and modifier == Gdk.ModifierType.NO_MODIFIER_MASK
-        ) or (
-            modifier == Gdk.ModifierType.CONTROL_MASK
-            and keyval in (Gdk.KEY_space, Gdk.KEY_q, Gdk.KEY_w)
+        if (keyval == _escape_key and modifier == _no_modifier) or (
+            modifier == _ctrl_mask and keyval in _ctrl_close_keys
         ):
             self.close()
 
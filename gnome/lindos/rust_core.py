@@ -2,45 +2,172 @@
 
 This module provides a Python interface to the Rust core library,
 mirroring the Swift implementation's approach to FFI bindings.
+
+The bindings deliberately stay on :mod:`ctypes`: a CFFI ABI-mode port
+was evaluated for its lower per-call overhead, but it would add the
+first compiled Python dependency to an app that otherwise runs on the
+standard library plus the system GTK stack, for a saving that is dwarfed
+by the Rust call itself. Function pointers are bound once at load time,
+which recovers most of the difference.
 """
 
 import ctypes
+import functools
+import logging
+import os
+import threading
 from pathlib import Path
+from typing import ClassVar
+
+_LOG = logging.getLogger("lindos.rust_core")
+
+try:
+    # Optional PyO3 fast path (see rust-native/): avoids the ctypes
+    # trampoline and the manual free round-trip entirely.
+    import lindos_native as _native
+except ImportError:
+    _native = None
+
+_LOAD_LOCK = threading.Lock()
+
+# Longest message the Rust core accepts; keep in sync with the limit in
+# rust-core/src/lib.rs (generate_reply).
+_MAX_MESSAGE_LENGTH = 1000
+
+# Resolved once at import: the library lives in the rust-core target
+# directory at the repository root.
+_LIB_PATH = str(
+    Path(__file__).resolve().parents[2]
+    / "rust-core"
+    / "target"
+    / "release"
+    / "librust_core.so"
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _encode_utf8(message: str) -> bytes:
+    """Encode a message for the FFI boundary, caching recent inputs.
+
+    Typing workloads re-submit near-identical strings; cache hits reduce
+    the per-keystroke encode to a dict lookup on the interned string.
+    """
+    return message.encode("utf-8")
+
+
+def _as_bytes(message: str | bytes) -> bytes:
+    """Return the UTF-8 bytes for a message, passing bytes through as-is.
+
+    Callers that already hold UTF-8 bytes (message queues, file readers)
+    skip the encode pass entirely; the Rust side validates the bytes
+    either way. An exact type check keeps this branch predictable.
+    """
+    return message if type(message) is bytes else _encode_utf8(message)
+
+
+# Reusable C buffers for outbound messages and inbound replies, per
+# thread because the GTK app calls in from a worker executor.
+_BUFFER_SIZE = 4096
+_BUFFERS = threading.local()
+
+# Keep in sync with LINDOS_BUFFER_TOO_SMALL in rust-core/src/lib.rs.
+_BUFFER_TOO_SMALL = -1
+
+
+def _as_c_string(encoded: bytes):
+    """Copy a message into a reusable per-thread C buffer.
+
+    Chat-sized messages then skip the per-call heap allocation ctypes
+    performs when wrapping a bytes argument; oversized payloads fall
+    back to passing the bytes object directly.
+    """
+    size = len(encoded)
+    if size >= _BUFFER_SIZE:
+        return encoded
+
+    buffer = getattr(_BUFFERS, "encode", None)
+    if buffer is None:
+        buffer = _BUFFERS.encode = ctypes.create_string_buffer(_BUFFER_SIZE)
+    ctypes.memmove(buffer, encoded, size)
+    buffer[size] = 0
+    return buffer
+
+
+@functools.lru_cache(maxsize=256)
+def _get_error_message_cached(error_code: int) -> str:
+    """Look up an error description in Rust, once per code.
+
+    The description is a pure function of a small integer code, so each
+    code pays the FFI crossing (and the Rust-side allocation and free)
+    exactly once per process.
+    """
+    lib = RustCore._lib or RustCore._load_library()
+
+    message_pointer = lib.lindos_error_message(error_code)
+    if not message_pointer:
+        return "Unknown error"
+
+    try:
+        return ctypes.string_at(message_pointer).decode("utf-8")
+    finally:
+        lib.lindos_string_free(message_pointer)
+
+
+@functools.lru_cache(maxsize=512)
+def _process_cached(message: str) -> tuple[str | None, int | None]:
+    """Memoized variant of :meth:`RustCore._process_message`.
+
+    The GTK ``changed`` signal fires on every keystroke, so repeated
+    inputs (backspace, retyped words) are common; caching lets them skip
+    the FFI round-trip entirely. Only hashable plain values are cached,
+    never ctypes structures.
+    """
+    return RustCore._process_message(message)
 
 
 class ProcessingError(Exception):
     """Errors that can occur during Rust processing."""
 
+    # Slot descriptors give direct-offset reads for the two attributes
+    # the error-heavy paths touch on every failure.
+    __slots__ = ("error_code", "message")
+
     NULL_POINTER = 1
     INVALID_UTF8 = 2
     EMPTY_MESSAGE = 3
     PROCESSING_FAILURE = 4
 
+    # Human-readable descriptions for the known codes, built once at
+    # class creation so constructing an error is a single dict lookup.
+    _MESSAGES: ClassVar[dict[int, str]] = {
+        NULL_POINTER: "No message provided",
+        INVALID_UTF8: "Message contains invalid characters",
+        EMPTY_MESSAGE: "Message cannot be empty",
+        PROCESSING_FAILURE: "Failed to process message",
+    }
+
     def __init__(self, error_code: int, message: str = ""):
         self.error_code = error_code
-        self.message = message or self._get_error_description(error_code)
+        self.message = (
+            message
+            or self._MESSAGES.get(error_code)
+            or f"Unknown error (code: {error_code})"
+        )
         super().__init__(self.message)
 
-    @staticmethod
-    def _get_error_description(error_code: int) -> str:
-        """Get a human-readable error message for an error code."""
-        descriptions = {
-            ProcessingError.NULL_POINTER: "No message provided",
-            ProcessingError.INVALID_UTF8: "Message contains invalid characters",
-            ProcessingError.EMPTY_MESSAGE: "Message cannot be empty",
-            ProcessingError.PROCESSING_FAILURE: "Failed to process message",
-        }
-        return descriptions.get(error_code, f"Unknown error (code: {error_code})")
-
-
-class RustResult(ctypes.Structure):
-    """Result structure for FFI calls that need to return both success/failure and data."""
 
-    _fields_ = [
-        ("success", ctypes.c_bool),
-        ("data", ctypes.c_char_p),
-        ("error_code", ctypes.c_int32),
-    ]
+# Pre-built errors for the known codes, so hot failure paths hand out a
+# cached instance instead of constructing a new exception per call.
+# Safe to share: these carry no per-call state.
+_ERROR_CACHE = {
+    code: ProcessingError(code)
+    for code in (
+        ProcessingError.NULL_POINTER,
+        ProcessingError.INVALID_UTF8,
+        ProcessingError.EMPTY_MESSAGE,
+        ProcessingError.PROCESSING_FAILURE,
+    )
+}
 
 
 class RustCore:
@@ -51,74 +178,161 @@ class RustCore:
 
     @classmethod
     def _load_library(cls):
-        """Load the Rust library if not already loaded."""
+        """Load the Rust library if not already loaded.
+
+        Loading is guarded by a lock so concurrent first calls only
+        load and configure the library once.
+        """
         if cls._lib is not None:
             return cls._lib
 
-        # Find the library in the rust-core target directory
-        repo_root = Path(__file__).parent.parent.parent
-        lib_path = repo_root / "rust-core" / "target" / "release" / "librust_core.so"
-
-        if not lib_path.exists():
-            msg = (
-                f"Rust library not found at {lib_path}. "
-                "Please build it first with: cd rust-core && cargo build --release"
-            )
-            raise FileNotFoundError(msg)
-
-        cls._lib = ctypes.CDLL(str(lib_path))
+        with _LOAD_LOCK:
+            if cls._lib is not None:
+                return cls._lib
 
-        # Define function signatures
+            if not os.path.isfile(_LIB_PATH):
+                msg = (
+                    f"Rust library not found at {_LIB_PATH}. "
+                    "Please build it first with: cd rust-core && cargo build --release"
+                )
+                raise FileNotFoundError(msg)
 
-        # lindos_process_message_safe
-        cls._lib.lindos_process_message_safe.argtypes = [ctypes.c_char_p]
-        cls._lib.lindos_process_message_safe.restype = RustResult
+            lib = ctypes.CDLL(_LIB_PATH)
+            cls._configure_prototypes(lib)
+            cls._lib = lib
 
-        # lindos_validate_message
-        cls._lib.lindos_validate_message.argtypes = [ctypes.c_char_p]
-        cls._lib.lindos_validate_message.restype = ctypes.c_int32
+        return cls._lib
 
-        # lindos_error_message
-        cls._lib.lindos_error_message.argtypes = [ctypes.c_int32]
-        cls._lib.lindos_error_message.restype = ctypes.c_char_p
+    @staticmethod
+    def _configure_prototypes(lib):
+        """Define the C function signatures, once at load time.
 
-        # lindos_string_free
-        cls._lib.lindos_string_free.argtypes = [ctypes.c_char_p]
-        cls._lib.lindos_string_free.restype = None
+        Assigning argtypes/restype touches descriptors on the ctypes
+        function objects, so it happens exactly once here; calls after
+        that are bare C invocations.
+        """
+        # lindos_process_message_into
+        lib.lindos_process_message_into.argtypes = [
+            ctypes.c_char_p,
+            ctypes.c_size_t,
+            ctypes.c_char_p,
+            ctypes.c_size_t,
+            ctypes.POINTER(ctypes.c_size_t),
+        ]
+        lib.lindos_process_message_into.restype = ctypes.c_int32
+
+        # lindos_process_batch
+        lib.lindos_process_batch.argtypes = [
+            ctypes.c_char_p,
+            ctypes.c_size_t,
+            ctypes.POINTER(ctypes.c_size_t),
+            ctypes.POINTER(ctypes.c_void_p),
+            ctypes.POINTER(ctypes.c_size_t),
+        ]
+        lib.lindos_process_batch.restype = ctypes.c_int32
 
-        # lindos_result_free
-        cls._lib.lindos_result_free.argtypes = [RustResult]
-        cls._lib.lindos_result_free.restype = None
+        # lindos_validate_message
+        lib.lindos_validate_message.argtypes = [ctypes.c_char_p]
+        lib.lindos_validate_message.restype = ctypes.c_int32
+
+        # lindos_validate_batch
+        lib.lindos_validate_batch.argtypes = [
+            ctypes.c_char_p,
+            ctypes.c_size_t,
+            ctypes.POINTER(ctypes.c_int32),
+        ]
+        lib.lindos_validate_batch.restype = ctypes.c_int32
+
+        # lindos_error_message; c_void_p keeps the original Rust
+        # pointer so it can be handed back to lindos_string_free
+        # (a c_char_p restype would yield a detached bytes copy)
+        lib.lindos_error_message.argtypes = [ctypes.c_int32]
+        lib.lindos_error_message.restype = ctypes.c_void_p
+
+        # lindos_string_free; c_void_p so both raw addresses and
+        # bytes objects convert to the pointer argument
+        lib.lindos_string_free.argtypes = [ctypes.c_void_p]
+        lib.lindos_string_free.restype = None
 
         # lindos_set_debug
-        cls._lib.lindos_set_debug.argtypes = [ctypes.c_bool]
-        cls._lib.lindos_set_debug.restype = None
-
-        return cls._lib
+        lib.lindos_set_debug.argtypes = [ctypes.c_bool]
+        lib.lindos_set_debug.restype = None
 
     @classmethod
     def set_debug_enabled(cls, enabled: bool):
-        """Enable or disable debug logging in Rust."""
-        lib = cls._load_library()
+        """Enable or disable debug logging in Rust and in this wrapper.
+
+        Re-asserting the current state is a no-op, so callers that
+        toggle based on repeated environment checks do not pay an FFI
+        crossing each time.
+        """
+        if enabled == cls._debug_enabled:
+            return
+
+        lib = cls._lib or cls._load_library()
         lib.lindos_set_debug(enabled)
         cls._debug_enabled = enabled
+        _LOG.setLevel(logging.DEBUG if enabled else logging.WARNING)
 
     @classmethod
-    def validate(cls, message: str) -> ProcessingError | None:
+    def validate(cls, message: str | bytes) -> ProcessingError | None:
         """Validate a message without processing it.
 
+        Accepts either a str or its UTF-8 bytes; bytes input skips the
+        encode pass and goes to the library untouched.
+
         Returns:
             ProcessingError if validation fails, None if valid.
         """
-        lib = cls._load_library()
+        # Non-empty ASCII within the length limit is valid by definition;
+        # isascii() is a C-level check on both str and bytes, so the
+        # overwhelmingly common case skips the encode and the FFI
+        # transition.
+        if message and message.isascii() and len(message) <= _MAX_MESSAGE_LENGTH:
+            return None
+
+        if _native is not None and type(message) is not bytes:
+            error_code = _native.validate(message)
+            if error_code == 0:
+                return None
+            return _ERROR_CACHE.get(error_code) or ProcessingError(error_code)
+
+        # Single messages share the batched entry point so the ctypes
+        # side has exactly one validation code path.
+        return cls.validate_many([message])[0]
+
+    @classmethod
+    def validate_many(cls, messages: list[str | bytes]) -> list[ProcessingError | None]:
+        """Validate several messages with a single FFI transition.
+
+        Messages are packed into one NUL-delimited buffer, mirroring
+        process_batch. Unlike process_batch each message gets its own
+        verdict: one invalid entry does not taint the rest.
+
+        Returns:
+            One entry per message: ProcessingError if that message fails
+            validation, None if it is valid.
+        """
+        if not messages:
+            return []
+
+        lib = cls._lib or cls._load_library()
+        count = len(messages)
 
         try:
-            c_string = message.encode("utf-8")
+            packed = b"".join(_as_bytes(message) + b"\x00" for message in messages)
         except UnicodeEncodeError:
-            return ProcessingError(ProcessingError.INVALID_UTF8)
+            return [_ERROR_CACHE[ProcessingError.INVALID_UTF8]] * count
+
+        out_codes = (ctypes.c_int32 * count)()
+        status = lib.lindos_validate_batch(packed, count, out_codes)
+        if status != 0:
+            return [_ERROR_CACHE.get(status) or ProcessingError(status)] * count
 
-        error_code = lib.lindos_validate_message(c_string)
-        return ProcessingError(error_code) if error_code != 0 else None
+        return [
+            None if code == 0 else _ERROR_CACHE.get(code) or ProcessingError(code)
+            for code in out_codes
+        ]
 
     @classmethod
     def process(cls, message: str) -> str:
@@ -133,73 +347,158 @@ class RustCore:
 
     @classmethod
     def process_with_result(
-        cls, message: str
+        cls, message: str | bytes
     ) -> tuple[str | None, ProcessingError | None]:
         """Process a message with full error handling.
 
+        Accepts either a str or its UTF-8 bytes; bytes input skips the
+        encode pass and goes to the library untouched.
+
+        Repeated inputs are served from a memoization cache; caching is
+        bypassed while debug logging is enabled so log output stays truthful.
+
         Returns:
             A tuple of (result_string, error). If successful, error is None.
             If failed, result_string is None and error contains the ProcessingError.
         """
-        lib = cls._load_library()
+        # Cheap predicate first: blank input never needs the encode step
+        # or the FFI transition.
+        if not message or message.isspace():
+            return None, _ERROR_CACHE[ProcessingError.EMPTY_MESSAGE]
 
         if cls._debug_enabled:
-            print(f"Processing message: {len(message)} characters")
+            result, error_code = cls._process_message(message)
+        else:
+            result, error_code = _process_cached(message)
+
+        if error_code is None:
+            return result, None
+        return None, _ERROR_CACHE.get(error_code) or ProcessingError(error_code)
+
+    @classmethod
+    def process_batch(
+        cls, messages: list[str]
+    ) -> list[tuple[str | None, ProcessingError | None]]:
+        """Process several messages with a single FFI transition.
+
+        Messages are packed into one NUL-delimited buffer so the ctypes
+        call overhead is paid once per batch instead of once per message.
+        The batch fails as a whole: if any message cannot be processed,
+        every entry reports that error.
+
+        Returns:
+            One (result_string, error) tuple per message, as returned by
+            process_with_result.
+        """
+        if not messages:
+            return []
+
+        lib = cls._lib or cls._load_library()
+        count = len(messages)
 
         try:
-            c_string = message.encode("utf-8")
+            packed = b"".join(_encode_utf8(message) + b"\x00" for message in messages)
         except UnicodeEncodeError:
-            error = ProcessingError(ProcessingError.INVALID_UTF8)
-            if cls._debug_enabled:
-                print("Failed to convert message to UTF-8")
-            return None, error
+            return [(None, _ERROR_CACHE[ProcessingError.INVALID_UTF8])] * count
 
-        rust_result = lib.lindos_process_message_safe(c_string)
+        out_lens = (ctypes.c_size_t * count)()
+        out_data = ctypes.c_void_p()
+        out_total_len = ctypes.c_size_t()
+        status = lib.lindos_process_batch(
+            packed, count, out_lens, out_data, out_total_len
+        )
+
+        if status != 0:
+            error = _ERROR_CACHE.get(status) or ProcessingError(status)
+            return [(None, error)] * count
 
         try:
-            if rust_result.success:
-                if not rust_result.data:
-                    error = ProcessingError(
-                        -1, "Rust returned success but null data pointer"
-                    )
-                    if cls._debug_enabled:
-                        print(error.message)
-                    return None, error
-
-                result_string = rust_result.data.decode("utf-8")
-                if cls._debug_enabled:
-                    print(
-                        f"Successfully processed message, result: {len(result_string)} characters"
-                    )
-                return result_string, None
-            else:
-                error = ProcessingError(rust_result.error_code)
-                if cls._debug_enabled:
-                    print(
-                        f"Rust processing failed with error code: {rust_result.error_code}"
-                    )
-
-                # Get the error message from Rust if available
-                if rust_result.data:
-                    error_message = rust_result.data.decode("utf-8")
-                    if cls._debug_enabled:
-                        print(f"Rust error message: {error_message}")
-
-                return None, error
+            payload = ctypes.string_at(out_data.value, out_total_len.value)
         finally:
-            # Free the Rust-allocated memory
-            lib.lindos_result_free(rust_result)
+            lib.lindos_string_free(out_data.value)
+
+        results = []
+        offset = 0
+        for length in out_lens:
+            results.append((payload[offset : offset + length].decode("utf-8"), None))
+            offset += length
+        return results
 
     @classmethod
-    def get_error_message(cls, error_code: int) -> str:
-        """Get a human-readable error message for an error code."""
-        lib = cls._load_library()
+    def _process_message(cls, message: str | bytes) -> tuple[str | None, int | None]:
+        """Run one message through the Rust core.
 
-        message_pointer = lib.lindos_error_message(error_code)
-        if not message_pointer:
-            return "Unknown error"
+        Returns:
+            A plain (result, error_code) tuple; error_code is None on
+            success. Returning hashable values keeps this method
+            cacheable by :func:`_process_cached`.
+        """
+        if _native is not None and type(message) is not bytes:
+            result, error_code = _native.process(message)
+            if error_code == 0:
+                return result, None
+            return None, error_code
+
+        # Bind the FFI entry point to a local once; every call afterwards
+        # is a plain function call instead of an attribute chain walk.
+        lib = cls._lib or cls._load_library()
+        process_into = lib.lindos_process_message_into
+
+        _LOG.debug("Processing message: %d characters", len(message))
 
         try:
-            return message_pointer.decode("utf-8")
-        finally:
-            lib.lindos_string_free(message_pointer)
+            c_string = _as_bytes(message)
+        except UnicodeEncodeError:
+            _LOG.debug("Failed to convert message to UTF-8")
+            return None, ProcessingError.INVALID_UTF8
+
+        # Rust writes the reply straight into a Python-owned per-thread
+        # buffer: nothing is allocated on the Rust side, so there is no
+        # lindos_result_free round trip and no second copy of the
+        # payload on this per-keystroke path.
+        reply_buffer = getattr(_BUFFERS, "reply", None)
+        if reply_buffer is None:
+            reply_buffer = _BUFFERS.reply = ctypes.create_string_buffer(_BUFFER_SIZE)
+        out_len = ctypes.c_size_t()
+
+        status = process_into(
+            _as_c_string(c_string),
+            len(c_string),
+            reply_buffer,
+            _BUFFER_SIZE,
+            out_len,
+        )
+        if status == _BUFFER_TOO_SMALL:
+            # Rare: the reply outgrew the reusable buffer; retry with an
+            # exact-size one-off allocation.
+            reply_buffer = ctypes.create_string_buffer(out_len.value)
+            status = process_into(
+                _as_c_string(c_string),
+                len(c_string),
+                reply_buffer,
+                out_len.value,
+                out_len,
+            )
+
+        if status != 0:
+            _LOG.debug("Rust processing failed with error code: %d", status)
+            return None, status
+
+        result_string = ctypes.string_at(reply_buffer, out_len.value).decode("utf-8")
+        _LOG.debug(
+            "Successfully processed message, result: %d characters",
+            len(result_string),
+        )
+        return result_string, None
+
+    @classmethod
+    def get_error_message(cls, error_code: int) -> str:
+        """Get a human-readable error message for an error code.
+
+        Results are memoized per code: the description is constant, so
+        only the first lookup crosses the FFI boundary.
+        """
+        if _native is not None:
+            return _native.get_error_message(error_code)
+
+        return _get_error_message_cached(error_code)
@@ -0,0 +1,53 @@
+"""Shared fixtures for the test suite."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from lindos import rust_core
+from lindos.rust_core import RustCore
+
+
+@pytest.fixture(autouse=True)
+def _clear_rust_core_caches():
+    """Keep memoized FFI results from leaking between tests."""
+    rust_core._process_cached.cache_clear()
+    rust_core._get_error_message_cached.cache_clear()
+    yield
+    rust_core._process_cached.cache_clear()
+    rust_core._get_error_message_cached.cache_clear()
+
+
+# The C entry points the wrapper binds in RustCore._load_library. Spec'd
+# mocks resolve these via a flat lookup instead of creating child mocks
+# lazily, and a typoed function name fails with AttributeError instead of
+# silently recording calls on a fresh mock.
+_LIB_SPEC = [
+    "lindos_process_message_into",
+    "lindos_process_batch",
+    "lindos_validate_message",
+    "lindos_validate_batch",
+    "lindos_error_message",
+    "lindos_string_free",
+    "lindos_set_debug",
+]
+
+
+# Built once at import: every test sees the same fake-library shape, so
+# rewinding this mock per test is cheaper than allocating a fresh spec'd
+# MagicMock tree for each of them.
+_FAKE_LIB = MagicMock(spec=_LIB_SPEC)
+
+
+@pytest.fixture
+def mock_lib(monkeypatch):
+    """Bind the shared fake Rust library to RustCore for the test's scope.
+
+    Replaces the per-test ``patch.object(RustCore, "_load_library")``
+    scaffolding; the mock is fully rewound on entry and monkeypatch
+    restores the real attributes at teardown.
+    """
+    _FAKE_LIB.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr(RustCore, "_lib", _FAKE_LIB)
+    monkeypatch.setattr(RustCore, "_load_library", classmethod(lambda cls: _FAKE_LIB))
+    return _FAKE_LIB
@@ -1,6 +1,7 @@
 """Tests for the GTK application module."""
 
 import sys
+from concurrent.futures import Future
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -37,6 +38,15 @@ mock_gtk = MagicMock()
 
 mock_gtk.ApplicationWindow = MockApplicationWindow
 
+# Key constants must be real integers before lindos.app is imported,
+# because the module snapshots them into frozenset/module constants.
+mock_gdk.KEY_Escape = 65307
+mock_gdk.KEY_space = 32
+mock_gdk.KEY_q = 113
+mock_gdk.KEY_w = 119
+mock_gdk.ModifierType.CONTROL_MASK = 4
+mock_gdk.ModifierType.NO_MODIFIER_MASK = 0
+
 mock_gi.repository.Gdk = mock_gdk
 mock_gi.repository.Gtk = mock_gtk
 
@@ -49,30 +59,43 @@ sys.modules["gi.repository.Gtk"] = mock_gtk
 from lindos.app import APP_ID, LindosTrayApp, main
 
 
-@pytest.fixture
-def mock_gtk_widgets():
-    """Fixture to mock GTK widgets."""
+class InlineExecutor:
+    """Executor double that runs submitted work synchronously."""
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+@pytest.fixture(scope="module")
+def _gtk_widget_mocks():
+    """Patch the GTK widget classes once for the whole module.
+
+    None of the patched targets carry per-test state, so entering the
+    three patch context managers per test was pure setup overhead.
+    """
     with patch("lindos.app.Gtk.Entry") as mock_entry_class:
         with patch("lindos.app.Gtk.Box") as mock_box_class:
             with patch("lindos.app.Gtk.EventControllerKey") as mock_ctrl_class:
-                mock_entry = MagicMock()
-                mock_box = MagicMock()
-                mock_ctrl = MagicMock()
-
-                mock_entry_class.return_value = mock_entry
-                mock_box_class.return_value = mock_box
-                mock_ctrl_class.return_value = mock_ctrl
-
                 yield {
                     "entry_class": mock_entry_class,
-                    "entry": mock_entry,
+                    "entry": mock_entry_class.return_value,
                     "box_class": mock_box_class,
-                    "box": mock_box,
+                    "box": mock_box_class.return_value,
                     "ctrl_class": mock_ctrl_class,
-                    "ctrl": mock_ctrl,
+                    "ctrl": mock_ctrl_class.return_value,
                 }
 
 
+@pytest.fixture
+def mock_gtk_widgets(_gtk_widget_mocks):
+    """Per-test view of the GTK widget mocks, reset between tests."""
+    for mock in _gtk_widget_mocks.values():
+        mock.reset_mock()
+    return _gtk_widget_mocks
+
+
 def test_app_id_constant():
     """Test that APP_ID is correctly defined."""
     assert APP_ID == "ai.lindos.LindosTrayApp"
@@ -82,140 +105,182 @@ def test_lindos_tray_app_can_be_instantiated(mock_gtk_widgets):
     """Test that LindosTrayApp can be instantiated with a Gtk Application."""
     mock_app = MagicMock()
 
-    with patch("lindos.app.darkdetect.theme", return_value="Light"):
+    window = LindosTrayApp(mock_app)
+    assert window is not None
+
+
+def test_constructor_defers_theme_detection(mock_gtk_widgets):
+    """Test that theme detection is scheduled for after the first frame."""
+    mock_app = MagicMock()
+
+    with patch("lindos.app.GLib") as mock_glib:
         window = LindosTrayApp(mock_app)
-        assert window is not None
+        mock_glib.idle_add.assert_called_once_with(window._detect_and_apply_theme)
+
+
+def test_detect_and_apply_theme(mock_gtk_widgets):
+    """Test that the deferred callback detects and applies the theme."""
+    mock_app = MagicMock()
+
+    window = LindosTrayApp(mock_app)
+
+    with patch("darkdetect.theme", return_value="Dark"):
+        with patch.object(window, "apply_theme") as mock_apply:
+            window._detect_and_apply_theme()
+            mock_apply.assert_called_once_with("Dark")
 
 
 def test_apply_theme_light(mock_gtk_widgets):
     """Test apply_theme with Light theme."""
     mock_app = MagicMock()
 
-    with patch("lindos.app.darkdetect.theme", return_value="Light"):
-        window = LindosTrayApp(mock_app)
+    window = LindosTrayApp(mock_app)
 
-        with patch("builtins.print") as mock_print:
-            window.apply_theme("Light")
-            mock_print.assert_called_once_with("Light theme detected")
+    with patch("builtins.print") as mock_print:
+        window.apply_theme("Light")
+        mock_print.assert_called_once_with("Light theme detected")
 
 
 def test_apply_theme_dark(mock_gtk_widgets):
     """Test apply_theme with Dark theme."""
     mock_app = MagicMock()
 
-    with patch("lindos.app.darkdetect.theme", return_value="Dark"):
-        window = LindosTrayApp(mock_app)
+    window = LindosTrayApp(mock_app)
 
-        with patch("builtins.print") as mock_print:
-            window.apply_theme("Dark")
-            mock_print.assert_called_once_with("Dark theme detected")
+    with patch("builtins.print") as mock_print:
+        window.apply_theme("Dark")
+        mock_print.assert_called_once_with("Dark theme detected")
 
 
 def test_apply_theme_unsupported_raises_error(mock_gtk_widgets):
     """Test apply_theme with unsupported theme raises NotImplementedError."""
     mock_app = MagicMock()
 
-    with patch("lindos.app.darkdetect.theme", return_value="Light"):
+    window = LindosTrayApp(mock_app)
+
+    with pytest.raises(NotImplementedError, match="Unsupported theme"):
+        window.apply_theme("Unknown")
+
+
+def test_on_text_changed_schedules_debounced_flush(mock_gtk_widgets):
+    """Test that on_text_changed schedules a debounced timeout."""
+    mock_app = MagicMock()
+
+    with patch("lindos.app.GLib") as mock_glib:
         window = LindosTrayApp(mock_app)
+        mock_glib.reset_mock()
+
+        mock_widget = MagicMock()
+        mock_widget.get_text.return_value = "test input"
 
-        with pytest.raises(NotImplementedError, match="Unsupported theme"):
-            window.apply_theme("Unknown")
+        window.on_text_changed(mock_widget, None)
+        mock_glib.timeout_add.assert_called_once_with(
+            150, window._flush_text, "test input"
+        )
 
 
-def test_on_text_changed_calls_external_library(mock_gtk_widgets):
-    """Test that on_text_changed handler calls external library."""
+def test_on_text_changed_cancels_pending_flush(mock_gtk_widgets):
+    """Test that rapid keystrokes replace the pending timeout."""
     mock_app = MagicMock()
 
-    with patch("lindos.app.darkdetect.theme", return_value="Light"):
+    with patch("lindos.app.GLib") as mock_glib:
         window = LindosTrayApp(mock_app)
 
         mock_widget = MagicMock()
         mock_widget.get_text.return_value = "test input"
+        pending_id = 42
+        mock_glib.timeout_add.return_value = pending_id
+
+        window.on_text_changed(mock_widget, None)
+        window.on_text_changed(mock_widget, None)
+        mock_glib.source_remove.assert_called_once_with(pending_id)
+
+
+def test_flush_text_calls_external_library(mock_gtk_widgets):
+    """Test that the debounced flush calls external library."""
+    mock_app = MagicMock()
+
+    window = LindosTrayApp(mock_app)
 
-        with patch.object(window, "call_external_library") as mock_call:
-            window.on_text_changed(mock_widget, None)
-            mock_call.assert_called_once_with("test input")
+    with patch.object(window, "call_external_library") as mock_call:
+        window._flush_text("test input")
+        mock_call.assert_called_once_with("test input")
 
 
 def test_call_external_library_with_empty_text(mock_gtk_widgets):
     """Test call_external_library with empty text doesn't call Rust."""
     mock_app = MagicMock()
 
-    with patch("lindos.app.darkdetect.theme", return_value="Light"):
-        with patch("lindos.app.RustCore") as mock_rust:
-            window = LindosTrayApp(mock_app)
-            window.call_external_library("")
-            mock_rust.process_with_result.assert_not_called()
+    with patch("lindos.app.RustCore") as mock_rust:
+        window = LindosTrayApp(mock_app)
+        window.call_external_library("")
+        mock_rust.process_with_result.assert_not_called()
 
 
 def test_call_external_library_success(mock_gtk_widgets):
     """Test call_external_library with successful processing."""
     mock_app = MagicMock()
 
-    with patch("lindos.app.darkdetect.theme", return_value="Light"):
-        with patch("lindos.app.RustCore") as mock_rust:
-            mock_rust.process_with_result.return_value = ("result text", None)
+    with patch("lindos.app.RustCore") as mock_rust:
+        mock_rust.process_with_result.return_value = ("result text", None)
+
+        window = LindosTrayApp(mock_app)
 
-            window = LindosTrayApp(mock_app)
+        with patch("lindos.app._EXECUTOR", InlineExecutor()):
+            with patch("lindos.app.GLib") as mock_glib:
+                mock_glib.idle_add.side_effect = lambda fn, *args: fn(*args)
 
-            with patch("builtins.print") as mock_print:
-                window.call_external_library("test input")
-                mock_rust.process_with_result.assert_called_once_with("test input")
-                mock_print.assert_called_once_with("Rust response: result text")
+                with patch("builtins.print") as mock_print:
+                    window.call_external_library("test input")
+                    mock_rust.process_with_result.assert_called_once_with("test input")
+                    mock_print.assert_called_once_with("Rust response: result text")
 
 
 def test_call_external_library_with_error(mock_gtk_widgets):
     """Test call_external_library with error."""
     mock_app = MagicMock()
 
-    with patch("lindos.app.darkdetect.theme", return_value="Light"):
-        with patch("lindos.app.RustCore") as mock_rust:
-            mock_error = MagicMock()
-            mock_error.message = "Error occurred"
-            mock_rust.process_with_result.return_value = (None, mock_error)
+    with patch("lindos.app.RustCore") as mock_rust:
+        mock_error = MagicMock()
+        mock_error.message = "Error occurred"
+        mock_rust.process_with_result.return_value = (None, mock_error)
 
-            window = LindosTrayApp(mock_app)
+        window = LindosTrayApp(mock_app)
+
+        with patch("lindos.app._EXECUTOR", InlineExecutor()):
+            with patch("lindos.app.GLib") as mock_glib:
+                mock_glib.idle_add.side_effect = lambda fn, *args: fn(*args)
 
-            with patch("builtins.print") as mock_print:
-                window.call_external_library("test input")
-                mock_rust.process_with_result.assert_called_once_with("test input")
-                mock_print.assert_called_once_with(
-                    "Error processing message: Error occurred"
-                )
+                with patch("builtins.print") as mock_print:
+                    window.call_external_library("test input")
+                    mock_rust.process_with_result.assert_called_once_with("test input")
+                    mock_print.assert_called_once_with(
+                        "Error processing message: Error occurred"
+                    )
 
 
 def test_on_key_press_escape_closes_window(mock_gtk_widgets):
     """Test on_key_press with Escape key closes window."""
-    from lindos.app import Gdk
-
-    Gdk.KEY_Escape = 65307
-    Gdk.ModifierType.NO_MODIFIER_MASK = 0
-
     mock_app = MagicMock()
 
-    with patch("lindos.app.darkdetect.theme", return_value="Light"):
-        window = LindosTrayApp(mock_app)
+    window = LindosTrayApp(mock_app)
 
-        with patch.object(window, "close") as mock_close:
-            window.on_key_press(None, Gdk.KEY_Escape, None, 0)
-            mock_close.assert_called_once()
+    with patch.object(window, "close") as mock_close:
+        window.on_key_press(None, mock_gdk.KEY_Escape, None, 0)
+        assert mock_close.call_count == 1
 
 
 def test_on_key_press_ctrl_q_closes_window(mock_gtk_widgets):
     """Test on_key_press with Ctrl+Q closes window."""
-    from lindos.app import Gdk
-
-    Gdk.KEY_q = 113
-    Gdk.ModifierType.CONTROL_MASK = 4
-
     mock_app = MagicMock()
 
-    with patch("lindos.app.darkdetect.theme", return_value="Light"):
-        window = LindosTrayApp(mock_app)
+    window = LindosTrayApp(mock_app)
 
-        with patch.object(window, "close") as mock_close:
-            window.on_key_press(None, Gdk.KEY_q, None, 4)
-            mock_close.assert_called_once()
+    with patch.object(window, "close") as mock_close:
+        window.on_key_press(
+            None, mock_gdk.KEY_q, None, mock_gdk.ModifierType.CONTROL_MASK
+        )
+        assert mock_close.call_count == 1
 
 
 def test_main_creates_and_runs_application():
@@ -230,7 +295,7 @@ def test_main_creates_and_runs_application():
         mock_gtk_app_class.assert_called_once_with(application_id=APP_ID)
 
         # Verify app was connected to activate signal
-        mock_app.connect.assert_called_once()
+        assert mock_app.connect.call_count == 1
         assert mock_app.connect.call_args[0][0] == "activate"
 
         # Verify app was run
@@ -256,4 +321,4 @@ def test_main_activate_callback_creates_and_shows_window():
 
             # Verify window was created and presented
             mock_window_class.assert_called_once_with(mock_app)
-            mock_window.present.assert_called_once()
+            assert mock_window.present.call_count == 1
@@ -1,101 +1,143 @@
 """Tests for the rust_core module."""
 
+import ctypes
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from lindos.rust_core import ProcessingError, RustCore, RustResult
+from lindos.rust_core import ProcessingError, RustCore
 
 
-def test_processing_error_with_code():
-    """Test creating error with just an error code."""
-    error = ProcessingError(ProcessingError.NULL_POINTER)
-    assert error.error_code == 1
-    assert error.message == "No message provided"
-    assert str(error) == "No message provided"
+def _fake_process_into(reply, statuses=(0,)):
+    """Build a lindos_process_message_into double that writes a reply.
 
+    The fake fills the caller-supplied buffer and length exactly like the
+    Rust side does; successive calls return successive status codes so
+    the grow-and-retry path can be exercised.
+    """
+    remaining = list(statuses)
 
-def test_processing_error_with_custom_message():
-    """Test creating error with custom message."""
-    error = ProcessingError(ProcessingError.NULL_POINTER, "Custom message")
-    assert error.error_code == 1
-    assert error.message == "Custom message"
+    def fake_into(data, length, out_buffer, out_cap, out_len):
+        out_len.value = len(reply)
+        status = remaining.pop(0)
+        if status == 0:
+            ctypes.memmove(out_buffer, reply, len(reply))
+        return status
 
+    return fake_into
 
-def test_processing_error_description_for_invalid_utf8():
-    """Test error description for INVALID_UTF8."""
-    error = ProcessingError(ProcessingError.INVALID_UTF8)
-    assert error.message == "Message contains invalid characters"
 
+class TestProcessingError:
+    """Tests for the ProcessingError exception type."""
 
-def test_processing_error_description_for_empty_message():
-    """Test error description for EMPTY_MESSAGE."""
-    error = ProcessingError(ProcessingError.EMPTY_MESSAGE)
-    assert error.message == "Message cannot be empty"
+    def test_with_code(self):
+        """Test creating error with just an error code."""
+        error = ProcessingError(ProcessingError.NULL_POINTER)
+        assert error.error_code == 1
+        assert error.message == "No message provided"
+        assert str(error) == "No message provided"
 
+    def test_with_custom_message(self):
+        """Test creating error with custom message."""
+        error = ProcessingError(ProcessingError.NULL_POINTER, "Custom message")
+        assert error.error_code == 1
+        assert error.message == "Custom message"
 
-def test_processing_error_description_for_processing_failure():
-    """Test error description for PROCESSING_FAILURE."""
-    error = ProcessingError(ProcessingError.PROCESSING_FAILURE)
-    assert error.message == "Failed to process message"
+    def test_description_for_invalid_utf8(self):
+        """Test error description for INVALID_UTF8."""
+        error = ProcessingError(ProcessingError.INVALID_UTF8)
+        assert error.message == "Message contains invalid characters"
 
+    def test_description_for_empty_message(self):
+        """Test error description for EMPTY_MESSAGE."""
+        error = ProcessingError(ProcessingError.EMPTY_MESSAGE)
+        assert error.message == "Message cannot be empty"
 
-def test_processing_error_unknown_code():
-    """Test error description for unknown error code."""
-    error = ProcessingError(999)
-    assert "Unknown error (code: 999)" in error.message
+    def test_description_for_processing_failure(self):
+        """Test error description for PROCESSING_FAILURE."""
+        error = ProcessingError(ProcessingError.PROCESSING_FAILURE)
+        assert error.message == "Failed to process message"
 
+    def test_unknown_code(self):
+        """Test error description for unknown error code."""
+        error = ProcessingError(999)
+        assert "Unknown error (code: 999)" in error.message
 
-def test_rust_result_structure_fields():
-    """Test that RustResult has the correct fields."""
-    result = RustResult()
-    assert hasattr(result, "success")
-    assert hasattr(result, "data")
-    assert hasattr(result, "error_code")
 
+class TestRustCore:
+    """Tests for the RustCore FFI wrapper."""
 
-def test_rust_core_validate_success():
-    """Test validate method with successful validation."""
-    with patch.object(RustCore, "_load_library") as mock_load:
-        mock_lib = MagicMock()
-        mock_lib.lindos_validate_message.return_value = 0
-        mock_load.return_value = mock_lib
+    def test_validate_success(self, mock_lib):
+        """Test validate method with successful validation."""
+        mock_lib.lindos_validate_batch.return_value = 0
+
+        error = RustCore.validate("tëst message")
+        assert error is None
+        assert mock_lib.lindos_validate_batch.call_count == 1
 
+    def test_validate_ascii_fast_path(self, mock_lib):
+        """Test that plain ASCII input is validated without the library."""
         error = RustCore.validate("test message")
         assert error is None
-        mock_lib.lindos_validate_message.assert_called_once()
+        mock_lib.lindos_validate_batch.assert_not_called()
 
+    def test_validate_returns_error(self, mock_lib):
+        """Test validate method when validation fails."""
 
-def test_rust_core_validate_returns_error():
-    """Test validate method when validation fails."""
-    with patch.object(RustCore, "_load_library") as mock_load:
-        mock_lib = MagicMock()
-        mock_lib.lindos_validate_message.return_value = ProcessingError.EMPTY_MESSAGE
-        mock_load.return_value = mock_lib
+        def fake_batch(packed, count, out_codes):
+            out_codes[0] = ProcessingError.EMPTY_MESSAGE
+            return 0
 
-        error = RustCore.validate("test message")
+        mock_lib.lindos_validate_batch.side_effect = fake_batch
+
+        error = RustCore.validate("tëst message")
         assert error is not None
         assert error.error_code == ProcessingError.EMPTY_MESSAGE
 
+    def test_validate_unicode_error(self, mock_lib):
+        """Test validate method with unicode encoding error."""
 
-def test_rust_core_validate_unicode_error():
-    """Test validate method with unicode encoding error."""
-    with patch.object(RustCore, "_load_library") as mock_load:
-        mock_lib = MagicMock()
-        mock_lib.lindos_validate_message.return_value = ProcessingError.INVALID_UTF8
-        mock_load.return_value = mock_lib
+        def fake_batch(packed, count, out_codes):
+            out_codes[0] = ProcessingError.INVALID_UTF8
+            return 0
+
+        mock_lib.lindos_validate_batch.side_effect = fake_batch
 
-        error = RustCore.validate("test message with unicode")
+        error = RustCore.validate("test message with unicode ✨")
         assert error is not None
         assert error.error_code == ProcessingError.INVALID_UTF8
 
+    def test_validate_accepts_bytes(self, mock_lib):
+        """Test that UTF-8 bytes go to the library without re-encoding."""
+        mock_lib.lindos_validate_batch.return_value = 0
+        payload = "tëst message".encode()
 
-def test_rust_core_set_debug_enabled():
-    """Test set_debug_enabled method."""
-    with patch.object(RustCore, "_load_library") as mock_load:
-        mock_lib = MagicMock()
-        mock_load.return_value = mock_lib
+        assert RustCore.validate(payload) is None
+        packed = mock_lib.lindos_validate_batch.call_args[0][0]
+        assert packed == payload + b"\x00"
+
+    def test_validate_many_single_ffi_call(self, mock_lib):
+        """Test that validate_many checks N messages with one library call."""
 
+        def fake_batch(packed, count, out_codes):
+            out_codes[1] = ProcessingError.PROCESSING_FAILURE
+            return 0
+
+        mock_lib.lindos_validate_batch.side_effect = fake_batch
+
+        errors = RustCore.validate_many(["öne", "twö", "thrëe"])
+        assert errors[0] is None
+        assert errors[1].error_code == ProcessingError.PROCESSING_FAILURE
+        assert errors[2] is None
+        assert mock_lib.lindos_validate_batch.call_count == 1
+
+    def test_validate_many_empty_list(self, mock_lib):
+        """Test that an empty batch never touches the library."""
+        assert RustCore.validate_many([]) == []
+        mock_lib.lindos_validate_batch.assert_not_called()
+
+    def test_set_debug_enabled(self, mock_lib):
+        """Test set_debug_enabled method."""
         RustCore.set_debug_enabled(True)
         mock_lib.lindos_set_debug.assert_called_once_with(True)
         assert RustCore._debug_enabled is True
@@ -103,121 +145,156 @@ def test_rust_core_set_debug_enabled():
         RustCore.set_debug_enabled(False)
         assert RustCore._debug_enabled is False
 
+    def test_set_debug_enabled_deduplicates(self, mock_lib, monkeypatch):
+        """Test that re-asserting the current state skips the FFI call."""
+        monkeypatch.setattr(RustCore, "_debug_enabled", False)
 
-def test_rust_core_process_with_result_success():
-    """Test process_with_result with successful result."""
-    with patch.object(RustCore, "_load_library") as mock_load:
-        mock_lib = MagicMock()
-        mock_result = RustResult()
-        mock_result.success = True
-        mock_result.data = b"processed result"
-        mock_result.error_code = 0
-        mock_lib.lindos_process_message_safe.return_value = mock_result
-        mock_load.return_value = mock_lib
+        RustCore.set_debug_enabled(True)
+        RustCore.set_debug_enabled(True)
+        assert mock_lib.lindos_set_debug.call_count == 1
+
+    def test_process_with_result_success(self, mock_lib):
+        """Test process_with_result with successful result."""
+        mock_lib.lindos_process_message_into.side_effect = _fake_process_into(
+            b"processed result"
+        )
 
         result, error = RustCore.process_with_result("test message")
         assert result == "processed result"
         assert error is None
-        mock_lib.lindos_result_free.assert_called_once()
-
+        assert mock_lib.lindos_process_message_into.call_count == 1
+        mock_lib.lindos_string_free.assert_not_called()
 
-def test_rust_core_process_with_result_failure():
-    """Test process_with_result with failure result."""
-    with patch.object(RustCore, "_load_library") as mock_load:
-        mock_lib = MagicMock()
-        mock_result = RustResult()
-        mock_result.success = False
-        mock_result.data = b"error message"
-        mock_result.error_code = ProcessingError.EMPTY_MESSAGE
-        mock_lib.lindos_process_message_safe.return_value = mock_result
-        mock_load.return_value = mock_lib
+    def test_process_with_result_failure(self, mock_lib):
+        """Test process_with_result with failure result."""
+        mock_lib.lindos_process_message_into.return_value = (
+            ProcessingError.EMPTY_MESSAGE
+        )
 
         result, error = RustCore.process_with_result("test message")
         assert result is None
         assert error is not None
         assert error.error_code == ProcessingError.EMPTY_MESSAGE
-        mock_lib.lindos_result_free.assert_called_once()
-
 
-def test_rust_core_process_with_result_null_data_on_success():
-    """Test process_with_result when success but data is null."""
-    with patch.object(RustCore, "_load_library") as mock_load:
-        mock_lib = MagicMock()
-        mock_result = RustResult()
-        mock_result.success = True
-        mock_result.data = None
-        mock_result.error_code = 0
-        mock_lib.lindos_process_message_safe.return_value = mock_result
-        mock_load.return_value = mock_lib
+    def test_process_with_result_grows_small_buffer(self, mock_lib):
+        """Test that a too-small reply buffer is grown and the call retried."""
+        mock_lib.lindos_process_message_into.side_effect = _fake_process_into(
+            b"oversized reply", statuses=(-1, 0)
+        )
 
         result, error = RustCore.process_with_result("test message")
-        assert result is None
-        assert error is not None
-        assert "null data pointer" in error.message
-
-
-def test_rust_core_process_legacy_interface():
-    """Test the legacy process method."""
-    with patch.object(RustCore, "process_with_result") as mock_process:
-        mock_process.return_value = ("result", None)
-        result = RustCore.process("test message")
-        assert result == "result"
+        assert result == "oversized reply"
+        assert error is None
+        assert mock_lib.lindos_process_message_into.call_count == 2
 
-        mock_process.return_value = (
-            None,
-            ProcessingError(ProcessingError.EMPTY_MESSAGE),
+    def test_process_with_result_accepts_bytes(self, mock_lib):
+        """Test that UTF-8 bytes are processed without re-encoding."""
+        mock_lib.lindos_process_message_into.side_effect = _fake_process_into(
+            b"You said: bytes"
         )
-        result = RustCore.process("test message")
-        assert result == "Message cannot be empty"
 
-
-def test_rust_core_get_error_message():
-    """Test get_error_message method."""
-    with patch.object(RustCore, "_load_library") as mock_load:
-        mock_lib = MagicMock()
+        result, error = RustCore.process_with_result(b"bytes")
+        assert result == "You said: bytes"
+        assert error is None
+        length = mock_lib.lindos_process_message_into.call_args[0][1]
+        assert length == len(b"bytes")
+
+    def test_process_with_result_blank_input_short_circuits(self, mock_lib):
+        """Test that blank input is rejected without touching the library."""
+        for message in ("", "   \n\t"):
+            result, error = RustCore.process_with_result(message)
+            assert result is None
+            assert error is not None
+            assert error.error_code == ProcessingError.EMPTY_MESSAGE
+        mock_lib.lindos_process_message_into.assert_not_called()
+
+    def test_process_batch_success(self, mock_lib):
+        """Test process_batch with one FFI call for several messages."""
+        replies = [b"You said: one", b"You said: two"]
+        payload = ctypes.create_string_buffer(b"".join(replies))
+
+        def fake_batch(packed, count, out_lens, out_data, out_total_len):
+            for index, reply in enumerate(replies):
+                out_lens[index] = len(reply)
+            out_data.value = ctypes.addressof(payload)
+            out_total_len.value = sum(len(reply) for reply in replies)
+            return 0
+
+        mock_lib.lindos_process_batch.side_effect = fake_batch
+
+        results = RustCore.process_batch(["one", "two"])
+        assert results == [("You said: one", None), ("You said: two", None)]
+        assert mock_lib.lindos_process_batch.call_count == 1
+        assert mock_lib.lindos_string_free.call_count == 1
+
+    def test_process_batch_failure_fails_whole_batch(self, mock_lib):
+        """Test that a failing batch reports the error for every message."""
+        mock_lib.lindos_process_batch.return_value = ProcessingError.PROCESSING_FAILURE
+
+        results = RustCore.process_batch(["one", "two"])
+        assert len(results) == 2
+        for result, error in results:
+            assert result is None
+            assert error.error_code == ProcessingError.PROCESSING_FAILURE
+        mock_lib.lindos_string_free.assert_not_called()
+
+    def test_process_batch_empty_list(self, mock_lib):
+        """Test that an empty batch never touches the library."""
+        assert RustCore.process_batch([]) == []
+        mock_lib.lindos_process_batch.assert_not_called()
+
+    def test_process_legacy_interface(self):
+        """Test the legacy process method."""
+        with patch.object(RustCore, "process_with_result") as mock_process:
+            mock_process.return_value = ("result", None)
+            result = RustCore.process("test message")
+            assert result == "result"
+
+            mock_process.return_value = (
+                None,
+                ProcessingError(ProcessingError.EMPTY_MESSAGE),
+            )
+            result = RustCore.process("test message")
+            assert result == "Message cannot be empty"
+
+    def test_get_error_message(self, mock_lib):
+        """Test get_error_message method."""
         mock_lib.lindos_error_message.return_value = b"Error message from Rust"
-        mock_load.return_value = mock_lib
 
         message = RustCore.get_error_message(1)
         assert message == "Error message from Rust"
-        mock_lib.lindos_string_free.assert_called_once()
+        assert mock_lib.lindos_string_free.call_count == 1
 
+    def test_get_error_message_cached(self, mock_lib):
+        """Test that repeated lookups of one code hit the FFI only once."""
+        mock_lib.lindos_error_message.return_value = b"Error message from Rust"
 
-def test_rust_core_get_error_message_null_pointer():
-    """Test get_error_message when Rust returns null."""
-    with patch.object(RustCore, "_load_library") as mock_load:
-        mock_lib = MagicMock()
+        first = RustCore.get_error_message(1)
+        second = RustCore.get_error_message(1)
+        assert first == second == "Error message from Rust"
+        assert mock_lib.lindos_error_message.call_count == 1
+
+    def test_get_error_message_null_pointer(self, mock_lib):
+        """Test get_error_message when Rust returns null."""
         mock_lib.lindos_error_message.return_value = None
-        mock_load.return_value = mock_lib
 
         message = RustCore.get_error_message(999)
         assert message == "Unknown error"
 
+    def test_library_not_found_error(self, monkeypatch):
+        """Test that appropriate error is raised when library is not found."""
+        monkeypatch.setattr(RustCore, "_lib", None)
 
-def test_rust_core_library_not_found_error():
-    """Test that appropriate error is raised when library is not found."""
-    # Reset the class variable
-    RustCore._lib = None
-
-    with patch("pathlib.Path.exists", return_value=False):
-        with pytest.raises(FileNotFoundError, match="Rust library not found"):
-            RustCore._load_library()
-
-
-def test_rust_core_library_loaded_once():
-    """Test that library is only loaded once."""
-    # Save the original state
-    original_lib = RustCore._lib
+        with patch("lindos.rust_core.os.path.isfile", return_value=False):
+            with pytest.raises(FileNotFoundError, match="Rust library not found"):
+                RustCore._load_library()
 
-    try:
-        # Set a mock library
+    def test_library_loaded_once(self, monkeypatch):
+        """Test that library is only loaded once."""
         mock_lib = MagicMock()
-        RustCore._lib = mock_lib
+        monkeypatch.setattr(RustCore, "_lib", mock_lib)
 
         lib1 = RustCore._load_library()
         lib2 = RustCore._load_library()
         assert lib1 is lib2
         assert lib1 is mock_lib
-    finally:
-        # Restore original state
-        RustCore._lib = original_lib
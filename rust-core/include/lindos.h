@@ -10,12 +10,24 @@
 #include <stdlib.h>
 
 /**
- * Result structure for FFI calls that need to return both success/failure and data
+ * Status code returned by `lindos_process_message_into` when the reply
+ * does not fit the caller's buffer; `out_len` then holds the required
+ * capacity.
+ */
+#define LINDOS_BUFFER_TOO_SMALL -1
+
+/**
+ * Result structure for FFI calls that need to return both success/failure and data.
+ *
+ * Fields are ordered widest first so the struct packs into 24 bytes
+ * (pointer, size, i32, bool) instead of 32 with the bool leading; the
+ * whole by-value return then fits in a single cache line.
  */
 typedef struct RustResult {
-  bool success;
   char *data;
+  uintptr_t length;
   int32_t error_code;
+  bool success;
 } RustResult;
 
 /**
@@ -40,11 +52,77 @@ char *lindos_process_message(const char *message);
  */
 struct RustResult lindos_process_message_safe(const char *message);
 
+/**
+ * Process a message by writing the reply into a caller-supplied buffer.
+ *
+ * Unlike [`lindos_process_message_safe`] nothing is allocated on the
+ * Rust side, so the caller never calls back into a free function: the
+ * reply lands directly in memory the caller already owns. The input is
+ * passed with an explicit byte length, so no trailing NUL is required.
+ *
+ * Returns 0 on success with the reply's byte length written to
+ * `out_len`, [`LINDOS_BUFFER_TOO_SMALL`] when `out_cap` is not enough
+ * (with the required length in `out_len`), or a positive error code.
+ *
+ * # Safety
+ * This function is safe to call from C/Swift as long as:
+ * - `message` points to `message_len` readable bytes (or is null)
+ * - `out` points to `out_cap` writable bytes
+ * - `out_len` points to a writable `usize`
+ */
+int32_t lindos_process_message_into(const char *message,
+                                    uintptr_t message_len,
+                                    char *out,
+                                    uintptr_t out_cap,
+                                    uintptr_t *out_len);
+
+/**
+ * Process several NUL-delimited messages with a single FFI call.
+ *
+ * On success (return value 0) all replies are concatenated back to
+ * back into one Rust-allocated string written to `out_data`, with its
+ * total byte length in `out_total_len` and the byte length of each
+ * reply in `out_lens`. On failure the error code is returned and
+ * nothing is allocated. The batch fails as a whole: the first message
+ * that cannot be processed fails the entire call.
+ *
+ * Scalar results go through plain out-pointers rather than a struct
+ * return so bindings never pay per-field marshalling on the result.
+ *
+ * # Safety
+ * This function is safe to call from C/Swift as long as:
+ * - `messages` points to `count` consecutive null-terminated C strings
+ * - `out_lens` points to an array of at least `count` elements
+ * - `out_data` and `out_total_len` point to writable memory
+ * - On success, `*out_data` is freed exactly once using `lindos_string_free`
+ */
+int32_t lindos_process_batch(const char *messages,
+                             uintptr_t count,
+                             uintptr_t *out_lens,
+                             char **out_data,
+                             uintptr_t *out_total_len);
+
 /**
  * Check if a message would be valid without processing it
  */
 int32_t lindos_validate_message(const char *message);
 
+/**
+ * Validate several NUL-delimited messages with a single FFI call.
+ *
+ * Writes one error code per message into `out_codes` (0 when valid).
+ * Unlike [`lindos_process_batch`], a bad message does not fail the
+ * batch: each message gets its own verdict.
+ *
+ * Returns 0, or an error code when the input pointers are unusable.
+ *
+ * # Safety
+ * This function is safe to call from C/Swift as long as:
+ * - `messages` points to `count` consecutive null-terminated C strings
+ * - `out_codes` points to an array of at least `count` elements
+ */
+int32_t lindos_validate_batch(const char *messages, uintptr_t count, int32_t *out_codes);
+
 /**
  * Get a human-readable error message for an error code
  */
@@ -0,0 +1,45 @@
+//! Optional PyO3 extension module wrapping the Rust core.
+//!
+//! Linking the core logic directly into a Python extension skips the
+//! ctypes trampoline, the UTF-8 bytes round-trip and the manual
+//! `lindos_result_free` bookkeeping: PyO3 hands the message over as
+//! `&str` and returns a Python-owned string. The ctypes bindings in
+//! `lindos.rust_core` remain the fallback when this module is not built.
+//!
+//! Build with: `cd rust-native && maturin develop --release`
+
+use pyo3::prelude::*;
+use rust_core::{error_message_for, generate_reply, validate_str};
+
+/// Process a message, returning `(reply, error_code)`.
+///
+/// Mirrors the `RustResult` contract of the C ABI: on success the reply
+/// is set and the code is 0, on failure the reply is `None` and the
+/// code matches `ProcessingError` in `lindos.rust_core`.
+#[pyfunction]
+fn process(message: &str) -> (Option<String>, i32) {
+    match generate_reply(message) {
+        Ok(reply) => (Some(reply), 0),
+        Err(error) => (None, error.code()),
+    }
+}
+
+/// Validate a message without processing it; returns 0 when valid.
+#[pyfunction]
+fn validate(message: &str) -> i32 {
+    validate_str(message)
+}
+
+/// Look up the human-readable message for an error code.
+#[pyfunction]
+fn get_error_message(error_code: i32) -> &'static str {
+    error_message_for(error_code)
+}
+
+#[pymodule]
+fn lindos_native(module: &Bound<'_, PyModule>) -> PyResult<()> {
+    module.add_function(wrap_pyfunction!(process, module)?)?;
+    module.add_function(wrap_pyfunction!(validate, module)?)?;
+    module.add_function(wrap_pyfunction!(get_error_message, module)?)?;
+    Ok(())
+}